@@ -1,7 +1,14 @@
+import functools
+
 from autogen_agentchat.agents import AssistantAgent
 from agents.prompts import categorizer_prompt
 from models import model_client
 
+@functools.lru_cache(maxsize=1)
+def _get_model_client():
+    """Creates the categorizer model client once so its connection pool is reused across agents."""
+    return model_client.get_categorizer_client()
+
 def get_agent() -> AssistantAgent:
     """
     Initializes and returns the categorizer agent.
@@ -14,7 +21,7 @@ def get_agent() -> AssistantAgent:
     """
     return AssistantAgent(
         name="categorizer",
-        model_client=model_client.get_categorizer_client(),
+        model_client=_get_model_client(),
         system_message=categorizer_prompt.SYSTEM_MESSAGE,
         reflect_on_tool_use=False,
     )
\ No newline at end of file
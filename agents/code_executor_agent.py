@@ -1,8 +1,63 @@
+import functools
 import os
+import subprocess
+import venv
+from types import SimpleNamespace
+from typing import Optional
+
 from autogen_agentchat.agents import CodeExecutorAgent
 from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
 from config import constants
 
+# Persistent virtual environment shared by every analysis run, so generated
+# scripts find their dependencies already installed instead of pip-installing them.
+_VENV_DIR = os.path.join(constants.TEMP_DIR, ".analysis_venv")
+_VENV_SENTINEL = os.path.join(_VENV_DIR, ".packages_installed")
+# Keep Numba's on-disk cache (used by @njit(cache=True) helpers) in one stable folder
+# instead of scattering __pycache__ entries across the per-run work directories.
+_NUMBA_CACHE_DIR = os.path.join(constants.TEMP_DIR, ".numba_cache")
+_ANALYSIS_PACKAGES = ["pandas", "numpy", "matplotlib", "seaborn", "tabulate", "pyarrow", "pybase64", "polars"]
+
+
+def _installed_packages() -> list:
+    """Returns the package list recorded by the last completed venv install."""
+    try:
+        with open(_VENV_SENTINEL) as f:
+            return f.read().split()
+    except FileNotFoundError:
+        return []
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_venv() -> Optional[SimpleNamespace]:
+    """
+    Creates the shared analysis virtual environment on first use.
+
+    The environment is built once and its packages installed once; a sentinel
+    file records the installed package list across processes (a changed list
+    triggers a reinstall), and the resolved context is memoized so later calls
+    within a process return immediately.
+
+    Returns:
+        (SimpleNamespace | None): The venv context for the executor, or None if
+                                  the environment could not be prepared.
+    """
+    builder = venv.EnvBuilder(with_pip=True)
+    try:
+        if _installed_packages() != _ANALYSIS_PACKAGES:
+            print(f"⏳ Preparing analysis environment in '{_VENV_DIR}'...")
+            builder.create(_VENV_DIR)
+            venv_context = builder.ensure_directories(_VENV_DIR)
+            subprocess.check_call([venv_context.env_exe, "-m", "pip", "install", *_ANALYSIS_PACKAGES])
+            with open(_VENV_SENTINEL, "w") as f:
+                f.write("\n".join(_ANALYSIS_PACKAGES))
+            return venv_context
+        return builder.ensure_directories(_VENV_DIR)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ Could not prepare analysis environment, using the system interpreter: {e}")
+        return None
+
+
 def get_agent(work_dir: str) -> CodeExecutorAgent:
     """
     Initializes and returns the code executor agent.
@@ -17,13 +72,20 @@ def get_agent(work_dir: str) -> CodeExecutorAgent:
     Returns:
         (CodeExecutorAgent): An instance of CodeExecutorAgent.
     """
-    
+
+    os.environ.setdefault("NUMBA_CACHE_DIR", _NUMBA_CACHE_DIR)
+    os.makedirs(os.environ["NUMBA_CACHE_DIR"], exist_ok=True)
+
     # The LocalCommandLineCodeExecutor runs code in a local subprocess.
-    # We create a new one for each run, pointed to a unique directory.
-    code_executor = LocalCommandLineCodeExecutor(work_dir=work_dir)
+    # We create a new one for each run, pointed to a unique directory, but
+    # reuse the pre-populated virtual environment across runs.
+    code_executor = LocalCommandLineCodeExecutor(
+        work_dir=work_dir,
+        virtual_env_context=_ensure_venv(),
+    )
 
     return CodeExecutorAgent(
         name="Python_Code_Executor",
         code_executor=code_executor,
         description="Python code executor agent that runs Python scripts locally."
-    )
\ No newline at end of file
+    )
@@ -1,28 +1,34 @@
+import functools
+
 from autogen_agentchat.agents import AssistantAgent
 from agents.prompts import data_analyzer_prompt
 from models import model_client
 from config import constants
 
+# The prompt only depends on CSV_ABS_PATH, which is fixed for the process, so format it once.
+_SYSTEM_MESSAGE = data_analyzer_prompt.SYSTEM_MESSAGE_TEMPLATE.format(
+    CSV_ABS_PATH=constants.CSV_ABS_PATH
+)
+
+@functools.lru_cache(maxsize=1)
+def _get_model_client():
+    """Creates the analyzer model client once so its connection pool is reused across agents."""
+    return model_client.get_analyzer_client()
+
 def get_agent() -> AssistantAgent:
     """
     Initializes and returns the data analyzer agent.
 
     This agent is responsible for writing and executing Python code to perform
     financial analysis and generate a markdown report, as defined in its system prompt.
-    It formats the system prompt with the absolute path to the data CSV.
+    Its system prompt is pre-formatted with the absolute path to the data CSV.
 
     Returns:
         (AssistantAgent): An instance of AssistantAgent configured for data analysis.
     """
-    
-    # Format the system message with the absolute path from constants
-    system_message = data_analyzer_prompt.SYSTEM_MESSAGE_TEMPLATE.format(
-        CSV_ABS_PATH=constants.CSV_ABS_PATH
-    )
-
     return AssistantAgent(
         name="Data_Analyzer",
-        model_client=model_client.get_analyzer_client(),
-        system_message=system_message,
+        model_client=_get_model_client(),
+        system_message=_SYSTEM_MESSAGE,
         description="Data analysis agent that processes and analyzes CSV data directly from temp/data.csv."
     )
\ No newline at end of file
@@ -1,5 +1,17 @@
 # agents/prompts/categorizer_prompt.py
 
+# The only values accepted in the Category column; keep in sync with the rules below.
+CATEGORIES = (
+    "Food & Dining",
+    "Merchandise & Services",
+    "Bills & Subscriptions",
+    "Travel & Transportation",
+    "Health & Wellness",
+    "Entertainment & Leisure",
+    "Financial Transactions",
+    "Uncategorized",
+)
+
 SYSTEM_MESSAGE = """
 You are an AI financial analyst. You will receive a csv file named 'data.csv'.
 Your purpose is to categorize financial transactions in a CSV file into a few broad categories.
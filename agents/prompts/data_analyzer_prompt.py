@@ -11,6 +11,7 @@ Notes:
 - amount is numeric (may include negatives for refunds/credits).
 - Category is a human-assigned category string (e.g., "Food & Dining", "Bills & Subscriptions").
 Do NOT move or copy the CSV file. Read it directly from temp/data.csv (absolute path provided above).
+The boilerplate keeps a cleaned Parquet cache next to the CSV (temp/data.csv.parquet); leave it in place.
 
 Ambiguity resolution:
 - If the user's request is not obviously a single, narrow calculation, treat it as BROAD and use Workflow 1.
@@ -112,26 +113,54 @@ The Python script MUST follow this template and MUST NOT create or reference any
 
 ```python
 # ----------------- BOILERPLATE START -----------------
-import sys, os, glob, traceback, base64, random
+import sys, os, glob, traceback, base64, random, csv
 from pathlib import Path
-import subprocess, importlib
+import subprocess, importlib, importlib.util
+
+ANALYSIS_PACKAGES = [("pandas", "pandas"), ("numpy", "numpy"), ("matplotlib", "matplotlib"), ("seaborn", "seaborn"),
+                     ("tabulate", "tabulate"), ("pyarrow", "pyarrow"), ("pybase64", "pybase64"), ("polars", "polars")]
+
+def is_installed(import_name):
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except ImportError:
+        return False
+
+def ensure_packages(wanted):
+    missing = [pkg for pkg, imp in wanted if not is_installed(imp)]
+    if not missing:
+        return
+    print(f"⏳ Installing {{' '.join(missing)}}..."); sys.stdout.flush()
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+    except subprocess.CalledProcessError:
+        # One bad package fails the whole batch; retry individually so the rest still install.
+        for pkg in missing:
+            try:
+                subprocess.check_call([sys.executable, "-m", "pip", "install", pkg])
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️ Failed to install {{pkg}}: {{e}}"); sys.stdout.flush()
+    importlib.invalidate_caches()
 
 def ensure_package(package_name, import_name=None):
     if import_name is None:
         import_name = package_name
-    try:
-        return importlib.import_module(import_name)
-    except ImportError:
-        print(f"⏳ Installing {{package_name}}..."); sys.stdout.flush()
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package_name])
-        return importlib.import_module(import_name)
+    ensure_packages([(package_name, import_name)])
+    return importlib.import_module(import_name)
 
+SCHEMA_COLUMNS = ["bank_name","cardholder","transaction_date","description","amount","Category"]
 generated_images = []  # (path, base64_len)
+b64_backend = base64  # replaced by pybase64 when it is available
 
 def embed_image(image_path, report_content):
     try:
         print(f"🖼️ Embedding image: {{image_path}}"); sys.stdout.flush()
-        b64 = base64.b64encode(Path(image_path).read_bytes()).decode()
+        parts = []
+        with open(image_path, "rb") as fh:
+            # Chunk size is a multiple of 3 so the encoded pieces concatenate without padding.
+            for chunk in iter(lambda: fh.read(3 * 21 * 1024), b""):
+                parts.append(b64_backend.b64encode(chunk).decode("ascii"))
+        b64 = "".join(parts)
         report_content += f"\\n![{{Path(image_path).stem}}](data:image/png;base64,{{b64}})\\n\\n"
         generated_images.append((str(image_path), len(b64)))
     except Exception as e:
@@ -184,11 +213,21 @@ def find_data_file():
 
 try:
     print("📊 Starting data analysis..."); sys.stdout.flush()
+    ensure_packages(ANALYSIS_PACKAGES)
     pd = ensure_package("pandas"); np = ensure_package("numpy")
-    plt = ensure_package("matplotlib", "matplotlib.pyplot"); seaborn = ensure_package("seaborn")
     try:
-        import matplotlib; matplotlib.use("Agg")
+        ensure_package("pyarrow")
+    except Exception as e:
+        print(f"ℹ️ pyarrow unavailable, using the default CSV engine: {{e}}"); sys.stdout.flush()
+    try:
+        b64_backend = ensure_package("pybase64")
+    except Exception as e:
+        print(f"ℹ️ pybase64 unavailable, using the standard base64 module: {{e}}"); sys.stdout.flush()
+    matplotlib = ensure_package("matplotlib")
+    try:
+        matplotlib.use("Agg")
     except Exception: pass
+    plt = ensure_package("matplotlib", "matplotlib.pyplot"); seaborn = ensure_package("seaborn")
     try:
         np.random.seed(42); random.seed(42)
     except Exception: pass
@@ -196,32 +235,90 @@ try:
     data_file_path = find_data_file()
     if data_file_path is None: sys.exit(1)
 
-    print(f"📂 Loading data from: {{data_file_path}}"); sys.stdout.flush()
-    df = pd.read_csv(data_file_path, encoding="utf-8-sig",
-                     dtype={{"bank_name":"string","cardholder":"string","description":"string","Category":"string"}})
+    # Cleaned data is cached as a Parquet sidecar; reuse it while it is newer than the CSV.
+    cache_path = data_file_path + ".parquet"
+    df = None
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(data_file_path):
+        try:
+            df = pd.read_parquet(cache_path, engine="pyarrow")
+            print(f"⚡ Loaded cleaned data from cache: {{cache_path}}"); sys.stdout.flush()
+        except Exception as e:
+            print(f"ℹ️ Ignoring unreadable cache {{cache_path}}: {{e}}"); sys.stdout.flush()
+            df = None
+
+    if df is None:
+        print(f"📂 Loading data from: {{data_file_path}}"); sys.stdout.flush()
+        # Fast path: clean amounts and text columns in one lazy, multithreaded polars plan.
+        try:
+            pl = ensure_package("polars")
+            lf = pl.scan_csv(data_file_path, infer_schema_length=0)
+            names = lf.collect_schema().names()
+            lf = lf.rename({{c: c.lstrip("\\ufeff") for c in names if c.startswith("\\ufeff")}})
+            names = [c.lstrip("\\ufeff") for c in names if c.lstrip("\\ufeff") in SCHEMA_COLUMNS]
+            lf = lf.select(names)
+            exprs = []
+            if "amount" in names:
+                amt = pl.col("amount").cast(pl.Utf8).str.strip_chars()
+                num = amt.str.replace_all(r"[,$()]", "").cast(pl.Float64, strict=False)
+                exprs.append(pl.when(amt.str.contains("(", literal=True)).then(-num).otherwise(num).alias("amount"))
+            for col in ["bank_name","cardholder","description","Category"]:
+                if col in names:
+                    exprs.append(pl.col(col).cast(pl.Utf8).fill_null("").str.strip_chars().alias(col))
+            if exprs:
+                lf = lf.with_columns(exprs)
+            df = lf.collect(engine="streaming").to_pandas(use_pyarrow_extension_array=True)
+            print("⚡ Cleaned amounts and text columns with polars"); sys.stdout.flush()
+        except Exception as e:
+            print(f"ℹ️ Falling back to pandas cleaning: {{e}}"); sys.stdout.flush()
+            df = None
 
-    # Normalize
-    if "amount" in df.columns:
-        s = df["amount"].astype(str).str.strip()
-        s = s.str.replace(r"[,$]", "", regex=True).str.replace(r"\\(", "-", regex=True).str.replace(r"\\)", "", regex=True)
-        df["amount"] = pd.to_numeric(s, errors="coerce")
-    if "transaction_date" in df.columns:
-        df["transaction_date"] = pd.to_datetime(df["transaction_date"], errors="coerce", utc=False)
-        if df["transaction_date"].isna().any():
-            orig = pd.read_csv(data_file_path, encoding="utf-8-sig", usecols=["transaction_date"])["transaction_date"]
-            for fmt in ["%m/%d/%Y","%Y-%m-%d","%d/%m/%Y","%m-%d-%Y","%Y/%m/%d","%B %d, %Y","%b %d, %Y","%d-%b-%Y","%d %B %Y"]:
-                na = df["transaction_date"].isna()
-                if na.any():
-                    df.loc[na, "transaction_date"] = pd.to_datetime(orig[na], format=fmt, errors="coerce")
+        if df is None:
+            # Only load schema columns; extra columns in the CSV are never used.
+            with open(data_file_path, encoding="utf-8-sig", newline="") as fh:
+                header = next(csv.reader(fh), [])
+            usecols = [c for c in header if c in SCHEMA_COLUMNS] or None
+            try:
+                df = pd.read_csv(data_file_path, encoding="utf-8-sig", usecols=usecols,
+                                 engine="pyarrow", dtype_backend="pyarrow")
+            except ImportError:
+                df = pd.read_csv(data_file_path, encoding="utf-8-sig", usecols=usecols,
+                                 dtype={{"bank_name":"string","cardholder":"string","description":"string","Category":"string"}})
+
+            # Normalize
+            if "amount" in df.columns:
+                s = df["amount"].astype(str).str.strip()
+                neg = s.str.contains("(", regex=False)
+                s = s.str.replace(r"[,$()]", "", regex=True)
+                s = s.where(~neg, "-" + s)
+                df["amount"] = pd.to_numeric(s, errors="coerce")
+            str_cols = [c for c in ["bank_name","cardholder","description","Category"] if c in df.columns]
+            if str_cols:
+                df[str_cols] = df[str_cols].astype("string").fillna("").apply(lambda col: col.str.strip())
+
+        if "transaction_date" in df.columns:
+            raw_dates = df["transaction_date"].astype("string")
+            try:
+                df["transaction_date"] = pd.to_datetime(raw_dates, format="mixed", dayfirst=False, errors="coerce")
+            except (TypeError, ValueError):
+                df["transaction_date"] = pd.to_datetime(raw_dates, errors="coerce", utc=False)
+                for fmt in ["%m/%d/%Y","%Y-%m-%d","%d/%m/%Y","%m-%d-%Y","%Y/%m/%d","%B %d, %Y","%b %d, %Y","%d-%b-%Y","%d %B %Y"]:
+                    na = df["transaction_date"].isna()
+                    if na.any():
+                        df.loc[na, "transaction_date"] = pd.to_datetime(raw_dates[na], format=fmt, errors="coerce")
             unparsed = df["transaction_date"].isna().sum()
             if unparsed>0:
                 print(f"⚠️ Could not parse {{unparsed}} date values"); sys.stdout.flush()
-    for col in ["bank_name","cardholder","description","Category"]:
-        if col in df.columns:
-            df[col] = df[col].fillna("").astype("string").str.strip()
 
-    before=len(df); df=df[df["amount"].notna()]; after=len(df)
-    if before>after: print(f"🧹 Dropped {{before-after}} rows with invalid amounts."); sys.stdout.flush()
+        before=len(df); df=df[df["amount"].notna()]; after=len(df)
+        if before>after: print(f"🧹 Dropped {{before-after}} rows with invalid amounts."); sys.stdout.flush()
+
+        try:
+            tmp_path = cache_path + ".tmp"
+            df.to_parquet(tmp_path, engine="pyarrow", compression="snappy", index=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"ℹ️ Could not write cache {{cache_path}}: {{e}}"); sys.stdout.flush()
+
     if "transaction_date" in df.columns:
         missing_dates = df["transaction_date"].isna().sum()
         if missing_dates>0: print(f"⚠️ {{missing_dates}} rows have unparsed dates but valid amounts - keeping them."); sys.stdout.flush()
@@ -242,6 +339,7 @@ Key Scripting Rules:
 Do not create any directories. Save all files to the current working directory.
 All charts must be saved as .png files with the fixed filenames listed above. Do not use pie charts or subplots.
 Always embed charts in the markdown by reading the saved PNG via embed_image.
+If a hot numeric helper benefits from numba, decorate it with @numba.njit(cache=True) so its compiled code is reused across runs.
 Maintain the generated_images list; after embedding, validate Base64 lengths (>1000). If a chart is too small/invalid, regenerate with simplified settings or a placeholder.
 Enforce the Quality Gate: exactly the 6 required slots must exist (use placeholders if needed), and embed at least 6 images before writing the report.
 Print a final confirmation: "Report written to report.md (charts embedded: N, tables rendered: M)".
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from a .env file in the project root
@@ -7,7 +8,8 @@ load_dotenv()
 # --- DIRECTORY AND FILE PATHS ---
 
 # We define the project root to build absolute paths, ensuring the script runs from anywhere
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_HERE = Path(__file__).resolve()
+PROJECT_ROOT = str(_HERE.parent.parent)
 
 # Folder for input PDF statements
 STATEMENTS_FOLDER = os.path.join(PROJECT_ROOT, "statements")
@@ -17,7 +19,16 @@ TEMP_DIR = os.path.join(PROJECT_ROOT, "temp")
 
 # Path for the processed CSV data that moves between tasks
 CSV_PATH = os.path.join(TEMP_DIR, "data.csv")
-CSV_ABS_PATH = os.path.abspath(CSV_PATH)
+# PROJECT_ROOT is already absolute, so no further path resolution is needed
+CSV_ABS_PATH = CSV_PATH
+# Columnar copy of the parser output, faster to reload than the CSV
+PARQUET_PATH = os.path.join(TEMP_DIR, "transactions.parquet")
+
+
+def ensure_dirs():
+    """Creates the temp and statements folders; call once at startup, not at import."""
+    os.makedirs(TEMP_DIR, exist_ok=True)
+    os.makedirs(STATEMENTS_FOLDER, exist_ok=True)
 
 
 # --- LARGE LANGUAGE MODEL CONFIGURATION ---
@@ -36,6 +47,13 @@ CATEGORIZER_MODEL = os.getenv("CATEGORIZER_MODEL", "gpt-4o")
 # Model for the final report generation task
 ANALYZER_MODEL = os.getenv("ANALYZER_MODEL", "gpt-4o")
 
+# Transactions sent per categorizer request, and how many requests may run at once
+CATEGORIZER_BATCH_SIZE = int(os.getenv("CATEGORIZER_BATCH_SIZE", "200"))
+CATEGORIZER_CONCURRENCY = int(os.getenv("CATEGORIZER_CONCURRENCY", "5"))
+
+# Persistent cache of categories keyed by a hash of the normalized description
+CATEGORY_CACHE_PATH = os.getenv("CATEGORY_CACHE_PATH", os.path.join(TEMP_DIR, "category_cache.sqlite"))
+
 
 # --- GOOGLE CLOUD DOCUMENT AI CONFIGURATION ---
 
@@ -50,3 +68,12 @@ GCP_PROCESSOR_ID = os.getenv("GCP_PROCESSOR_ID", "bf2685d686b2d8db")
 
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
+# Number of statements sent to Document AI concurrently
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "8"))
+
+# Optional Cloud Storage bucket for Document AI batch processing; when unset,
+# statements are sent one synchronous request per file
+GCS_BATCH_BUCKET = os.getenv("GCS_BATCH_BUCKET")
+# Seconds to wait for a batch operation to finish
+GCS_BATCH_TIMEOUT = int(os.getenv("GCS_BATCH_TIMEOUT", "900"))
+
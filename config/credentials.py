@@ -0,0 +1,67 @@
+import hashlib
+import os
+import sys
+
+from config import constants
+
+
+def _fallback_credentials_path() -> str:
+    """Returns the credentials file path inside the project's temp folder."""
+    return os.path.join(constants.TEMP_DIR, "gcp_creds.json")
+
+
+def _credentials_path() -> str:
+    """Returns where the GCP credentials file lives: a per-user tmpfs file on Linux, the temp folder elsewhere."""
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        # /dev/shm is shared by every user on the machine, so the name must be per-user.
+        return f"/dev/shm/gcp_creds_{os.getuid()}.json"
+    return _fallback_credentials_path()
+
+
+def _write_credentials(creds_path: str, gcp_creds_json: str):
+    """Writes the key file readable by its owner only, tightening the mode of an existing file too."""
+    os.makedirs(os.path.dirname(creds_path), exist_ok=True)
+    fd = os.open(creds_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        # The mode passed to os.open only applies when the file is created. This also
+        # fails, before anything is written, on a file that another user owns.
+        os.fchmod(fd, 0o600)
+        f.write(gcp_creds_json)
+
+
+def setup_gcp_credentials():
+    """
+    Materializes the GCP_CREDENTIALS_JSON environment variable as a key file.
+
+    Google Cloud client libraries read credentials from the file named by
+    GOOGLE_APPLICATION_CREDENTIALS. The file is only (re)written when its
+    contents differ from the environment variable, so repeated startups with
+    unchanged credentials skip the write entirely. If the tmpfs location cannot
+    be written, the file goes to the temp folder instead.
+    """
+    gcp_creds_json = os.getenv("GCP_CREDENTIALS_JSON")
+    if not gcp_creds_json:
+        return
+
+    creds_path = _credentials_path()
+    expected_digest = hashlib.sha256(gcp_creds_json.encode("utf-8")).hexdigest()
+
+    try:
+        with open(creds_path, "rb") as f:
+            up_to_date = hashlib.sha256(f.read()).hexdigest() == expected_digest
+        # An existing file may have been created with wider permissions.
+        up_to_date = up_to_date and os.stat(creds_path).st_mode & 0o077 == 0
+    except OSError:
+        up_to_date = False
+
+    if not up_to_date:
+        try:
+            _write_credentials(creds_path, gcp_creds_json)
+        except OSError as e:
+            if creds_path == _fallback_credentials_path():
+                raise
+            print(f"⚠️ Could not write credentials to '{creds_path}', using the temp folder instead: {e}")
+            creds_path = _fallback_credentials_path()
+            _write_credentials(creds_path, gcp_creds_json)
+
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = creds_path
@@ -6,35 +6,30 @@ from datetime import datetime, timezone
 
 from autogen_agentchat.messages import TextMessage
 
-from config import constants
+from config import constants, credentials
 from services import parser, categorizer_task
 from agents import data_analyzer_agent, code_executor_agent
 from teams import finance_team
 
-# --- GCP CREDENTIALS SETUP ---
-# This block must run before any code that uses Google Cloud services.
-gcp_creds_json = os.getenv("GCP_CREDENTIALS_JSON")
-if gcp_creds_json:
-    os.makedirs(constants.TEMP_DIR, exist_ok=True)
-    creds_path = os.path.join(constants.TEMP_DIR, "gcp_creds.json")
-    with open(creds_path, "w") as f:
-        f.write(gcp_creds_json)
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = creds_path
-# --- END GCP CREDENTIALS SETUP ---
+def _bootstrap():
+    """
+    Prepares the runtime environment once per process: the data folders and the
+    GCP credentials file, which must exist before any Google Cloud call.
+    """
+    constants.ensure_dirs()
+    credentials.setup_gcp_credentials()
 
 async def main():
     """
     Main asynchronous function to run the end-to-end financial analysis workflow.
     """
-    # --- 1. PDF Parsing ---
-    parser.run_parsing()
+    _bootstrap()
 
-    # --- 2. Transaction Categorization ---
-    await categorizer_task.run_categorization()
+    # --- 1. PDF Parsing ---
+    # Parsing is blocking Document AI I/O, so run it in a worker thread and
+    # build the analysis agents and team while it is in flight.
+    parse_task = asyncio.create_task(asyncio.to_thread(parser.run_parsing))
 
-    # --- 3. Report Generation ---
-    print("\n🚀 Starting final report generation...")
-    
     run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:8]
     work_dir = os.path.join(constants.TEMP_DIR, f"run_{run_id}")
     output_dir = os.path.join(work_dir, "output")
@@ -43,9 +38,17 @@ async def main():
 
     analyzer = data_analyzer_agent.get_agent()
     executor = code_executor_agent.get_agent(work_dir)
-    
+
     team = finance_team.create_team(analyzer, executor)
-    
+
+    transactions = await parse_task
+
+    # --- 2. Transaction Categorization ---
+    await categorizer_task.run_categorization(transactions)
+
+    # --- 3. Report Generation ---
+    print("\n🚀 Starting final report generation...")
+
     # --- CHOOSE YOUR QUESTION TYPE ---
     # Example for Workflow 1 (Broad Report)
     user_question = "Analyze the CSV and produce a comprehensive report."
@@ -100,5 +103,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    os.makedirs(constants.TEMP_DIR, exist_ok=True)
     asyncio.run(main())
\ No newline at end of file
@@ -1,6 +1,26 @@
+import functools
+import importlib.util
+
 from autogen_ext.models.openai import OpenAIChatCompletionClient
+from openai import DefaultAsyncHttpxClient
 from config import constants
 
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> DefaultAsyncHttpxClient:
+    """
+    Returns the HTTP client shared by every OpenAI model client.
+
+    Sharing one connection pool lets the categorizer and analyzer reuse warm
+    keep-alive connections to the OpenAI endpoint instead of each paying for
+    its own TCP/TLS handshake. The client is built by the openai package itself,
+    so it always matches the HTTP library that openai was installed with.
+    HTTP/2 is enabled when the h2 package is installed.
+
+    Returns:
+        (DefaultAsyncHttpxClient): The shared asynchronous HTTP client.
+    """
+    return DefaultAsyncHttpxClient(http2=importlib.util.find_spec("h2") is not None)
+
 def get_categorizer_client():
     """
     Initializes and returns the OpenAI client configured for the categorization task.
@@ -19,6 +39,7 @@ def get_categorizer_client():
     return OpenAIChatCompletionClient(
         model=constants.CATEGORIZER_MODEL,
         api_key=constants.OPENAI_API_KEY,
+        http_client=_get_http_client(),
     )
 
 def get_analyzer_client():
@@ -43,4 +64,5 @@ def get_analyzer_client():
         temperature=constants.LLM_TEMPERATURE,
         top_p=constants.LLM_TOP_P,
         seed=constants.LLM_SEED,
+        http_client=_get_http_client(),
     )
\ No newline at end of file
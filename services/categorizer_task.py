@@ -1,4 +1,14 @@
-import re
+import asyncio
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
 
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
@@ -6,28 +16,120 @@ from autogen_agentchat.messages import TextMessage
 
 from config import constants
 from agents import categorizer_agent
+from agents.prompts.categorizer_prompt import CATEGORIES
 
-async def run_categorization():
-    """
-    Runs the AutoGen agent workflow to categorize transactions.
+_CSV_HEADER = "bank_name,cardholder,transaction_date,description,amount,Category"
+# The parser's Parquet snapshot carries extra typed columns; only these are categorized.
+_INPUT_COLUMNS = _CSV_HEADER.split(",")[:-1]
+
+def _extract_csv_from_text(text: str) -> Optional[str]:
+    """Extracts the categorized CSV block from an agent reply, or None if the header is missing."""
+    # Find the start of the CSV content by looking for the known header.
+    header_index = text.find(_CSV_HEADER)
+    if header_index == -1:
+        return None
+
+    # Take everything from the header up to a closing code fence, if the agent added one.
+    fence_index = text.find("```", header_index)
+    csv_block = text[header_index:fence_index if fence_index != -1 else len(text)].strip()
+
+    # Clean the trailing "STOP" keyword if it exists.
+    if csv_block.endswith("STOP"):
+        csv_block = csv_block[:-4].strip()
+    return csv_block
+
+
+def _description_key(description: str) -> str:
+    """Hashes a description after upper-casing it and collapsing whitespace, so trivial variants share a key."""
+    normalized = " ".join(description.upper().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _load_cached_categories(keys: Iterable[str]) -> Dict[str, str]:
+    """Looks up previously assigned categories for the given description keys."""
+    keys = list(keys)
+    found = {}
+    with closing(sqlite3.connect(constants.CATEGORY_CACHE_PATH)) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS categories (desc_hash TEXT PRIMARY KEY, category TEXT NOT NULL)")
+        # Stay well under SQLite's bound-parameter limit.
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT desc_hash, category FROM categories WHERE desc_hash IN ({placeholders})"
+            found.update(conn.execute(query, chunk).fetchall())
+    return found
+
+
+def _store_categories(categories: Dict[str, str]):
+    """Persists newly assigned categories keyed by description hash."""
+    with closing(sqlite3.connect(constants.CATEGORY_CACHE_PATH)) as conn, conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS categories (desc_hash TEXT PRIMARY KEY, category TEXT NOT NULL)")
+        conn.executemany("INSERT OR REPLACE INTO categories (desc_hash, category) VALUES (?, ?)", categories.items())
+
+
+def _frame_to_rows(df: pd.DataFrame) -> Tuple[List[str], List[List[str]]]:
+    """Converts a transactions frame to a header and string rows, matching what csv.reader would produce."""
+    df = df[_INPUT_COLUMNS]
+    # Missing values become empty strings, as in the CSV.
+    return list(df.columns), df.astype(object).fillna("").astype(str).values.tolist()
+
+
+def _read_transactions() -> Tuple[Optional[List[str]], List[List[str]]]:
     """
-    print("🚀 Starting transaction categorization...")
+    Loads the parsed transactions as a header and string rows.
+
+    The parser's Parquet snapshot is preferred while it is at least as new as
+    the CSV; once the CSV has been rewritten (e.g. after a categorization run)
+    the CSV is the source of truth.
+
+    Returns:
+        (Tuple[List[str] | None, List[List[str]]]): The header and data rows.
 
+    Raises:
+        FileNotFoundError: If neither the Parquet snapshot nor the CSV exists.
+    """
     try:
-        with open(constants.CSV_PATH, "r", encoding="utf-8") as f:
-            input_csv_text = f.read()
+        use_parquet = os.path.getmtime(constants.PARQUET_PATH) >= os.path.getmtime(constants.CSV_PATH)
     except FileNotFoundError:
-        print(f"❌ Error: Input CSV not found at '{constants.CSV_PATH}'. Please run the parser first.")
-        return
+        use_parquet = os.path.exists(constants.PARQUET_PATH) and not os.path.exists(constants.CSV_PATH)
+
+    if use_parquet:
+        try:
+            return _frame_to_rows(pd.read_parquet(constants.PARQUET_PATH, engine="pyarrow", columns=_INPUT_COLUMNS))
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️ Could not read '{constants.PARQUET_PATH}', falling back to the CSV: {e}")
+
+    with open(constants.CSV_PATH, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        return next(reader, None), list(reader)
+
+
+async def _categorize_batch(header: List[str], rows: List[List[str]], semaphore: asyncio.Semaphore) -> Optional[List[List[str]]]:
+    """
+    Categorizes one batch of transaction rows with its own categorizer agent.
+
+    Args:
+        header (List[str]): The input CSV header row.
+        rows (List[List[str]]): The transaction rows in this batch.
+        semaphore (asyncio.Semaphore): Bounds how many batches call the model at once.
+
+    Returns:
+        (List[List[str]] | None): The categorized rows without the header, or None if
+                                  no CSV could be extracted from the agent's reply.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
 
     agent = categorizer_agent.get_agent()
 
     task_message = TextMessage(
         content=(
-            "The input CSV columns are exactly: bank_name, cardholder, transaction_date, description, amount.\\n"
+            "The input CSV columns are exactly: bank_name, cardholder, transaction_date, description, amount.\n"
             "Append a new final column named 'Category', categorize each row using ONLY the allowed categories, "
-            "and return ONLY the CSV text with the new column included.\\n\\n"
-            f"{input_csv_text}"
+            "and return ONLY the CSV text with the new column included.\n\n"
+            f"{buffer.getvalue()}"
         ),
         source="user",
     )
@@ -37,42 +139,113 @@ async def run_categorization():
         termination_condition=TextMentionTermination("STOP") | MaxMessageTermination(max_messages=2),
     )
 
-    chat_result = await team.run(task=task_message)
+    async with semaphore:
+        chat_result = await team.run(task=task_message)
 
-    final_csv_text = None
     if chat_result and chat_result.messages:
-        
-        # --- START: ADD THIS DIAGNOSTIC CODE ---
+        for msg in reversed(chat_result.messages):
+            if msg.source == agent.name and msg.content:
+                csv_text = _extract_csv_from_text(str(msg.content).strip())
+                if csv_text:
+                    categorized_rows = list(csv.reader(io.StringIO(csv_text)))[1:]
+                    if len(categorized_rows) != len(rows):
+                        print(f"⚠️ Expected {len(rows)} categorized rows but received {len(categorized_rows)}.")
+                    return categorized_rows
+
+        # Surface the raw reply to help diagnose extraction failures.
         print("\n--- Agent's Raw Response ---")
-        last_message_content = chat_result.messages[-1].content
-        print(last_message_content)
+        print(chat_result.messages[-1].content)
         print("----------------------------\n")
-        # --- END: ADD THIS DIAGNOSTIC CODE ---
+    return None
 
-        for msg in reversed(chat_result.messages):
-            if msg.source == agent.name and msg.content:
-                content_str = str(msg.content).strip()
-                
-                # --- START: ROBUST EXTRACTION LOGIC ---
-                # Find the start of the CSV content by looking for the known header.
-                header = "bank_name,cardholder,transaction_date,description,amount,Category"
-                header_index = content_str.find(header)
-                
-                if header_index != -1:
-                    # Take everything from the header to the end of the string.
-                    csv_block = content_str[header_index:]
-                    
-                    # Clean the trailing "STOP" keyword if it exists.
-                    if csv_block.endswith("STOP"):
-                        csv_block = csv_block[:-4].strip()
-                    
-                    final_csv_text = csv_block
-                    break  # Exit the loop once we've found and processed the CSV block.
-                # --- END: ROBUST EXTRACTION LOGIC ---
-
-    if final_csv_text:
-        with open(constants.CSV_PATH, "w", encoding="utf-8", newline="") as f:
-            f.write(final_csv_text if final_csv_text.endswith("\\n") else final_csv_text + "\\n")
-        print(f"✅ Categorization complete. Updated CSV saved to '{constants.CSV_PATH}'")
-    else:
-        print("❌ Error: Failed to extract categorized CSV from the agent's response.")
\ No newline at end of file
+
+async def run_categorization(transactions: Optional[pa.Table] = None):
+    """
+    Runs the AutoGen agent workflow to categorize transactions.
+
+    Categories are cached by a hash of the normalized description, so only one
+    representative row per previously unseen description is sent to the agent.
+    Those rows are split into batches of constants.CATEGORIZER_BATCH_SIZE that
+    are categorized concurrently, with at most constants.CATEGORIZER_CONCURRENCY
+    model calls in flight, and the results are mapped back onto every row.
+
+    Args:
+        transactions (pa.Table, optional): The table returned by parser.run_parsing().
+                                           When given, the parsed files are not re-read.
+    """
+    print("🚀 Starting transaction categorization...")
+
+    try:
+        if transactions is not None:
+            header, rows = _frame_to_rows(transactions.select(_INPUT_COLUMNS).to_pandas())
+        else:
+            header, rows = _read_transactions()
+    except FileNotFoundError:
+        print(f"❌ Error: Input CSV not found at '{constants.CSV_PATH}'. Please run the parser first.")
+        return
+
+    if not header or not rows:
+        print(f"❌ Error: No transactions found in '{constants.CSV_PATH}'.")
+        return
+
+    # Re-running on an already categorized CSV replaces the existing Category column.
+    if "Category" in header:
+        category_index = header.index("Category")
+        header = header[:category_index] + header[category_index + 1:]
+        rows = [row[:category_index] + row[category_index + 1:] for row in rows]
+
+    description_index = header.index("description")
+    row_keys = [_description_key(row[description_index]) for row in rows]
+    categories = _load_cached_categories(set(row_keys))
+
+    # One representative row per description the cache has not seen yet.
+    pending = {}
+    for key, row in zip(row_keys, rows):
+        if key not in categories and key not in pending:
+            pending[key] = row
+    print(f"Categorizing {len(rows)} transactions: {len(pending)} new description(s), "
+          f"{len(set(row_keys)) - len(pending)} cached.")
+
+    if pending:
+        pending_keys = list(pending)
+        batch_size = constants.CATEGORIZER_BATCH_SIZE
+        key_batches = [pending_keys[i:i + batch_size] for i in range(0, len(pending_keys), batch_size)]
+        print(f"Sending {len(pending_keys)} row(s) to the categorizer in {len(key_batches)} batch(es)...")
+
+        semaphore = asyncio.Semaphore(constants.CATEGORIZER_CONCURRENCY)
+        # A failing batch (e.g. a rate-limit error) must not discard the batches that succeeded.
+        results = await asyncio.gather(*(
+            _categorize_batch(header, [pending[key] for key in keys], semaphore) for keys in key_batches
+        ), return_exceptions=True)
+
+        new_categories = {}
+        for batch_number, categorized_rows in enumerate(results, start=1):
+            if isinstance(categorized_rows, BaseException):
+                print(f"❌ Error: Categorizer batch {batch_number} failed: {categorized_rows}")
+                continue
+            if categorized_rows is None:
+                continue
+            for row in categorized_rows:
+                # Only complete rows with an allowed category are trusted; anything else would
+                # persist in the cache. Rows left out fall back to "Uncategorized" below.
+                if len(row) != len(header) + 1 or row[-1].strip() not in CATEGORIES:
+                    continue
+                # Key every returned row by its own description: the agent may reorder,
+                # drop or merge rows, and a misattributed category would persist in the cache.
+                key = _description_key(row[description_index])
+                if key in pending:
+                    new_categories[key] = row[-1].strip()
+        _store_categories(new_categories)
+        categories.update(new_categories)
+
+        failed = [i + 1 for i, result in enumerate(results) if result is None or isinstance(result, BaseException)]
+        if failed:
+            print(f"❌ Error: Failed to categorize batch(es) {failed}; categories from the other batches were cached.")
+            return
+
+    with open(constants.CSV_PATH, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header + ["Category"])
+        for key, row in zip(row_keys, rows):
+            writer.writerow(row + [categories.get(key, "Uncategorized")])
+    print(f"✅ Categorization complete. Updated CSV saved to '{constants.CSV_PATH}'")
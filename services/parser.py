@@ -1,21 +1,52 @@
+import functools
 import os
-from typing import Optional, Dict, List, Any
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable, List, Any
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from google.api_core.client_options import ClientOptions
 from google.cloud import documentai
 
 from config import constants
 
+# Fixed schema of the Parquet snapshot, so per-statement chunks can be appended as they arrive.
+_OUTPUT_SCHEMA = pa.schema([
+    ('bank_name', pa.dictionary(pa.int32(), pa.string())),
+    ('cardholder', pa.dictionary(pa.int32(), pa.string())),
+    ('transaction_date', pa.large_string()),
+    ('description', pa.large_string()),
+    ('amount', pa.large_string()),
+    ('amount_cents', pa.int64()),
+])
+# Columns of the CSV hand-off; the LLM steps expect exactly these.
+_CSV_COLUMNS = ['bank_name', 'cardholder', 'transaction_date', 'description', 'amount']
+_CSV_SCHEMA = pa.schema([(column, pa.large_string()) for column in _CSV_COLUMNS])
+
 # --- Private Helper Functions ---
 
 def _extract_entity_text(entity: documentai.Document.Entity, document_text: str) -> str:
     """Extracts text from an entity's text anchor segments."""
-    if not entity.text_anchor or not entity.text_anchor.text_segments:
+    text_anchor = entity.text_anchor
+    segments = text_anchor.text_segments if text_anchor else None
+    if not segments:
         return entity.mention_text or ""
     
+    # Fast path: most entities are a single contiguous span.
+    if len(segments) == 1:
+        segment = segments[0]
+        start_index = int(segment.start_index) if segment.start_index else 0
+        end_index = int(segment.end_index) if segment.end_index else len(document_text)
+        return document_text[start_index:end_index].strip()
+    
     text_parts = []
-    for segment in entity.text_anchor.text_segments:
+    for segment in segments:
         start_index = int(segment.start_index) if segment.start_index else 0
         end_index = int(segment.end_index) if segment.end_index else len(document_text)
         text_parts.append(document_text[start_index:end_index])
@@ -23,211 +54,479 @@ def _extract_entity_text(entity: documentai.Document.Entity, document_text: str)
     return "".join(text_parts).strip()
 
 
-def _parse_bank_statement_info(document: documentai.Document) -> (Dict[str, Any], Dict):
-    """Parses high-level bank statement info and groups entities by type."""
-    entities_by_type = {}
+def _parse_bank_statement_info(document: documentai.Document, document_text: str, default_bank_name: str = 'Unknown') -> (Dict[str, Any], List):
+    """Parses high-level bank statement info and collects the table_item entities in one pass."""
+    table_items = []
+    bank_name_entity = None
     for entity in document.entities:
         entity_type = entity.type_
-        if entity_type not in entities_by_type:
-            entities_by_type[entity_type] = []
-        entities_by_type[entity_type].append(entity)
+        if entity_type == 'table_item':
+            table_items.append(entity)
+        elif entity_type == 'bank_name' and bank_name_entity is None:
+            bank_name_entity = entity
     
     statement_info = {}
-    bank_name_entity = entities_by_type.get('bank_name', [None])[0]
     
     if bank_name_entity:
-        statement_info['bank_name'] = _extract_entity_text(bank_name_entity, document.text)
+        statement_info['bank_name'] = _extract_entity_text(bank_name_entity, document_text)
     else:
-        statement_info['bank_name'] = 'Unknown'
+        statement_info['bank_name'] = default_bank_name
 
     statement_info['all_cardholders'] = ["MOHIT AGGARWAL", "HIMANI SOOD"]
-    return statement_info, entities_by_type
+    return statement_info, table_items
 
 
-def _parse_table_items(entities_by_type: Dict, document_text: str, all_cardholders: List[str]) -> List[Dict[str, Any]]:
-    """Parses table_item entities into structured transaction records."""
-    if 'table_item' not in entities_by_type:
-        return []
+def _parse_table_items(table_items: List, document_text: str, all_cardholders: List[str], current_cardholder: str = "Unknown") -> Dict[str, List[Any]]:
+    """Parses table_item entities into transaction columns (one list per field, None where absent)."""
+    if not table_items:
+        return {}
     
-    transactions = []
-    current_cardholder = "Unknown"
+    transactions = {'item_id': [], 'cardholder': []}
+    # One precompiled alternation finds any cardholder in a single scan of each row.
+    cardholder_pattern = re.compile("|".join(map(re.escape, all_cardholders))) if all_cardholders else None
     
-    for i, table_item in enumerate(entities_by_type['table_item']):
+    for i, table_item in enumerate(table_items):
         raw_text = _extract_entity_text(table_item, document_text)
         
-        for name in all_cardholders:
-            if name in raw_text:
-                current_cardholder = name
-                break
+        matches = cardholder_pattern.findall(raw_text) if cardholder_pattern else []
+        if matches:
+            # Keep the list order as the tie-breaker when a row mentions several cardholders.
+            current_cardholder = next((name for name in all_cardholders if name in matches), matches[0])
         
-        transaction = {'item_id': i, 'cardholder': current_cardholder}
+        transactions['item_id'].append(i)
+        transactions['cardholder'].append(current_cardholder)
+        row_count = i + 1
         
         if table_item.properties:
             for prop in table_item.properties:
                 prop_type = prop.type_
                 prop_value = _extract_entity_text(prop, document_text)
-                transaction[prop_type] = prop_value
+                column = transactions.get(prop_type)
+                if column is None:
+                    # First time this property is seen: back-fill earlier rows.
+                    column = transactions[prop_type] = [None] * i
+                if len(column) == row_count:
+                    column[-1] = prop_value  # A repeated property keeps its last value
+                else:
+                    column.append(prop_value)
         
-        transactions.append(transaction)
+        # Keep every column aligned for properties this row does not have.
+        for column in transactions.values():
+            if len(column) < row_count:
+                column.append(None)
     
     return transactions
 
 
-def _analyze_and_create_dataframe(document: documentai.Document) -> pd.DataFrame | None:
-    """Analyzes a document, extracts transactions, and returns a DataFrame."""
-    statement_info, entities_by_type = _parse_bank_statement_info(document)
+def _analyze_and_create_dataframe(document: documentai.Document, bank_name: str = 'Unknown', cardholder: str = "Unknown") -> pd.DataFrame | None:
+    """
+    Analyzes a document, extracts transactions, and returns a DataFrame.
+
+    Args:
+        document (documentai.Document): The processed document, or one shard of it.
+        bank_name (str): Bank name to use when the document has no bank_name entity.
+        cardholder (str): Cardholder of the rows before the first cardholder name appears.
+
+    Returns:
+        (pd.DataFrame | None): The extracted transactions, or None if there were none.
+    """
+    # Read the (possibly multi-MB) document text from the proto once and share it.
+    document_text = document.text
+    statement_info, table_items = _parse_bank_statement_info(document, document_text, bank_name)
     print("\n=== STATEMENT INFO ===")
     for key, value in statement_info.items():
         print(f"{key}: {value}")
         
-    transactions = _parse_table_items(entities_by_type, document.text, statement_info['all_cardholders'])
+    transactions = _parse_table_items(table_items, document_text, statement_info['all_cardholders'], cardholder)
     
     if not transactions:
         print("❌ No transactions extracted")
         return None
 
-    df = pd.DataFrame(transactions)
-    df['bank_name'] = statement_info.get('bank_name', 'N/A')
+    df = pd.DataFrame(transactions, copy=False)
+    # One statement has one bank, so store it as a single-category column (1 byte per row).
+    bank_name = statement_info.get('bank_name', 'N/A')
+    df['bank_name'] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[bank_name])
+    # Hold the extracted text fields in contiguous Arrow buffers instead of one Python str per cell.
+    text_columns = [column for column in df.columns if column.startswith('table_item/')]
+    df[text_columns] = df[text_columns].astype('string[pyarrow]')
     
     print(f"\n=== TRANSACTION SUMMARY ===")
     print(f"Total transactions found: {len(df)}")
     return df
 
 
+def _coalesce_columns(df: pd.DataFrame, primary: str, fallback: str) -> pd.arrays.ArrowStringArray:
+    """Returns the primary column's text with missing entries taken from the fallback column; either may be absent."""
+    columns = [pa.array(df[name], type=pa.large_string()) for name in (primary, fallback) if name in df]
+    if not columns:
+        return pd.arrays.ArrowStringArray(pa.nulls(len(df), type=pa.large_string()))
+    # Arrow's coalesce kernel fills the gaps without materializing Python objects.
+    return pd.arrays.ArrowStringArray(pc.coalesce(*columns) if len(columns) > 1 else columns[0])
+
+
+def _amount_to_cents(amounts: pd.Series) -> pd.Series:
+    """Parses currency strings like '$1,234.56', '-$40.00' or '(12.50)' into Int64 cents; unparseable values become <NA>."""
+    numbers = pd.to_numeric(amounts.str.replace(r'[^\d.\-]', '', regex=True), errors='coerce')
+    cents = (numbers * 100).round().astype('Int64')
+    # Accounting-style parentheses mark negative amounts.
+    negative = amounts.str.contains('(', regex=False).fillna(False).to_numpy(dtype=bool)
+    return cents.where(~negative, -cents)
+
+
+def _infer_date(date_str: str) -> Optional[str]:
+    """Parses a date in any format pandas recognizes into a YYYY-MM-DD string, or None if it cannot."""
+    try:
+        parsed_date = pd.to_datetime(date_str, errors='coerce')
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return parsed_date.strftime('%Y-%m-%d') if pd.notna(parsed_date) else None
+
+
 def _preprocess_transactions(df: pd.DataFrame) -> pd.DataFrame:
     """Cleans, coalesces, and standardizes the transaction DataFrame."""
-    processed_df = df.copy()
-
-    # Coalesce description, amount, and date columns from deposit/withdrawal fields
-    processed_df['description'] = processed_df.get('table_item/transaction_withdrawal_description').fillna(
-        processed_df.get('table_item/transaction_deposit_description')
-    )
-    processed_df['amount'] = processed_df.get('table_item/transaction_withdrawal').fillna(
-        processed_df.get('table_item/transaction_deposit')
-    )
-    processed_df['transaction_date'] = processed_df.get('table_item/transaction_withdrawal_date').fillna(
-        processed_df.get('table_item/transaction_deposit_date')
+    # Build a new frame holding only the essential columns, with description, amount,
+    # and date coalesced from the deposit/withdrawal fields; the input is never copied.
+    processed_df = pd.DataFrame(
+        {
+            'bank_name': df['bank_name'].array,
+            'cardholder': df['cardholder'].astype('category').array,
+            'transaction_date': _coalesce_columns(
+                df, 'table_item/transaction_withdrawal_date', 'table_item/transaction_deposit_date'
+            ),
+            'description': _coalesce_columns(
+                df, 'table_item/transaction_withdrawal_description', 'table_item/transaction_deposit_description'
+            ),
+            'amount': _coalesce_columns(df, 'table_item/transaction_withdrawal', 'table_item/transaction_deposit'),
+        },
+        index=df.index,
     )
+    # Parse the amount once into exact integer cents; the display string is kept for the CSV.
+    processed_df['amount_cents'] = _amount_to_cents(processed_df['amount'])
 
-    # Keep only the essential columns
-    processed_df = processed_df[['bank_name', 'cardholder', 'transaction_date', 'description', 'amount']].copy()
+    # Records whose final 'amount' is missing or zero are dropped; amounts that do
+    # not parse as numbers are kept, as their text may still be meaningful.
+    keep = (processed_df['amount'].notna() & processed_df['amount_cents'].ne(0).fillna(True)).to_numpy(dtype=bool)
 
-    # Drop records where the final 'amount' is missing or zero
-    processed_df.dropna(subset=['amount'], inplace=True)
-    processed_df = processed_df[~processed_df['amount'].isin(['$0.00', '+$0.00'])]
+    # --- DATE PARSING ---
+    # Each format is tried once over the column's still-unparsed values, so the
+    # parsing runs in pandas' vectorized loops instead of once per row in Python.
+    # Rows already being dropped for their amount are never parsed.
+    dates = processed_df['transaction_date'].str.strip()
+    has_date = keep & dates.fillna('').ne('').to_numpy(dtype=bool)
+    current_year = pd.Timestamp.now().year
 
-    # --- THIS IS THE CORRECTED DATE PARSING LOGIC ---
-    def standardize_date(date_str):
-        if pd.isna(date_str) or date_str == '':
-            return None
-        
-        date_str = str(date_str).strip()
-        current_year = pd.Timestamp.now().year
-        
-        # Try different date formats
-        date_formats = [
-            '%m/%d/%Y',    # MM/DD/YYYY
-            '%m-%d-%Y',    # MM-DD-YYYY  
-            '%Y-%m-%d',    # YYYY-MM-DD
-            '%b %d',       # Jun 25, Jul 7 (abbreviated month, no year)
-            '%B %d',       # June 25, July 7 (full month, no year)
-            '%b %d, %Y',   # Jun 25, 2024 (abbreviated month with year)
-            '%B %d, %Y',   # June 25, 2024 (full month with year)
-            '%d %b',       # 25 Jun (day first, abbreviated month)
-            '%d %B',       # 25 June (day first, full month)
-            '%d %b %Y',    # 25 Jun 2024 (day first with year)
-            '%d %B %Y',    # 25 June 2024 (day first with year)
-            '%m/%d',       # MM/DD (no year)
-            '%m-%d'        # MM-DD (no year)
-        ]
-        
-        for fmt in date_formats:
-            try:
-                if fmt in ['%m/%d', '%m-%d', '%b %d', '%B %d', '%d %b', '%d %B']:
-                    # Add current year for formats without year
-                    if fmt in ['%m/%d', '%m-%d']:
-                        parsed_date = pd.to_datetime(f"{current_year}/{date_str}", format=f'%Y/{fmt}')
-                    else:
-                        # For month name formats, append current year
-                        parsed_date = pd.to_datetime(f"{date_str} {current_year}", format=f'{fmt} %Y')
-                else:
-                    parsed_date = pd.to_datetime(date_str, format=fmt)
-                
-                # Return as YYYY-MM-DD string format
-                return parsed_date.strftime('%Y-%m-%d')
-            except (ValueError, TypeError):
+    # Try different date formats
+    date_formats = [
+        '%m/%d/%Y',    # MM/DD/YYYY
+        '%m-%d-%Y',    # MM-DD-YYYY  
+        '%Y-%m-%d',    # YYYY-MM-DD
+        '%b %d',       # Jun 25, Jul 7 (abbreviated month, no year)
+        '%B %d',       # June 25, July 7 (full month, no year)
+        '%b %d, %Y',   # Jun 25, 2024 (abbreviated month with year)
+        '%B %d, %Y',   # June 25, 2024 (full month with year)
+        '%d %b',       # 25 Jun (day first, abbreviated month)
+        '%d %B',       # 25 June (day first, full month)
+        '%d %b %Y',    # 25 Jun 2024 (day first with year)
+        '%d %B %Y',    # 25 June 2024 (day first with year)
+        '%m/%d',       # MM/DD (no year)
+        '%m-%d'        # MM-DD (no year)
+    ]
+
+    # Results are accumulated as YYYY-MM-DD strings rather than datetimes, so no
+    # datetime unit is imposed: a misread year such as 1024 is kept, as a single
+    # Timestamp would keep it, instead of overflowing a nanosecond column.
+    standardized = pd.Series(pd.NA, index=dates.index, dtype='string[pyarrow]')
+    for fmt in date_formats:
+        pending = dates[standardized.isna().to_numpy() & has_date]
+        if pending.empty:
+            break
+
+        if fmt in ['%m/%d', '%m-%d']:
+            # Add current year for formats without year
+            parsed = pd.to_datetime(f"{current_year}/" + pending, format=f'%Y/{fmt}', errors='coerce')
+        elif fmt in ['%b %d', '%B %d', '%d %b', '%d %B']:
+            # For month name formats, append current year
+            parsed = pd.to_datetime(pending + f" {current_year}", format=f'{fmt} %Y', errors='coerce')
+        else:
+            parsed = pd.to_datetime(pending, format=fmt, errors='coerce')
+        standardized = standardized.fillna(parsed.dt.strftime('%Y-%m-%d').astype('string[pyarrow]'))
+
+    # Last resort - let pandas infer each remaining value on its own. These are few,
+    # and parsing them one by one keeps one odd value from affecting the others.
+    pending = dates[standardized.isna().to_numpy() & has_date]
+    if not pending.empty:
+        standardized = standardized.fillna(pending.map(_infer_date).astype('string[pyarrow]'))
+
+    # Drop records with a missing/zero amount or an invalid date with a single combined mask
+    processed_df['transaction_date'] = standardized
+    keep &= standardized.notna().to_numpy()
+    
+    return processed_df[keep]
+
+
+def _process_one_pdf(file_path: str, client: documentai.DocumentProcessorServiceClient, name: str) -> Optional[pd.DataFrame]:
+    """
+    Sends one PDF statement to Document AI and returns its cleaned transactions.
+
+    Errors are contained per file so that one bad statement does not abort the batch.
+
+    Args:
+        file_path (str): Path to the PDF statement.
+        client (documentai.DocumentProcessorServiceClient): Shared, thread-safe Document AI client.
+        name (str): Full resource name of the Document AI processor.
+
+    Returns:
+        (pd.DataFrame | None): The cleaned transactions, or None if nothing could be extracted.
+    """
+    file_name = os.path.basename(file_path)
+    print(f"\n📄 Processing file: {file_name}")
+
+    try:
+        # The proto message needs real bytes (mmap/memoryview are rejected), so read the
+        # file straight into the request without keeping a second reference to the buffer.
+        with open(file_path, "rb") as image:
+            request = documentai.ProcessRequest(
+                name=name,
+                raw_document=documentai.RawDocument(content=image.read(), mime_type="application/pdf"),
+            )
+        document = client.process_document(request=request).document
+        # Release the PDF bytes before the CPU-side extraction of this worker.
+        del request
+
+        return _document_to_transactions(document, file_name)
+    except Exception as e:
+        print(f"❌ Error processing '{file_name}': {e}")
+        return None
+
+
+def _document_to_transactions(document: documentai.Document, file_name: str) -> Optional[pd.DataFrame]:
+    """Extracts and cleans the transactions of one processed document."""
+    if not document:
+        print(f"⚠️ Could not process document: {file_name}")
+        return None
+
+    df = _analyze_and_create_dataframe(document)
+    if df is None or df.empty:
+        return None
+
+    cleaned_df = _preprocess_transactions(df)
+    print(f"✅ Successfully cleaned and added {len(cleaned_df)} transactions from {file_name}.")
+    return cleaned_df
+
+
+def _batch_process_pdfs(pdf_paths: List[str], client: documentai.DocumentProcessorServiceClient, name: str) -> List[pd.DataFrame]:
+    """
+    Processes all statements with a single Document AI batch operation.
+
+    The PDFs are uploaded to a run-specific prefix in constants.GCS_BATCH_BUCKET,
+    processed server-side in one long-running operation (which also lifts the
+    page limit of synchronous requests), and the JSON results are read back.
+    Everything uploaded or written under the prefix is deleted afterwards.
+
+    Args:
+        pdf_paths (List[str]): Paths of the PDF statements to process.
+        client (documentai.DocumentProcessorServiceClient): The Document AI client.
+        name (str): Full resource name of the Document AI processor.
+
+    Returns:
+        (List[pd.DataFrame]): The cleaned transactions per statement, in input order.
+    """
+    # Only needed for batch mode, so the dependency stays optional for the default path.
+    from google.cloud import storage
+
+    bucket = storage.Client().bucket(constants.GCS_BATCH_BUCKET)
+    run_prefix = f"personal_finance_tracker/{uuid.uuid4().hex}"
+    workers = min(constants.PARSER_WORKERS, len(pdf_paths))
+
+    def upload(path: str) -> str:
+        blob = bucket.blob(f"{run_prefix}/input/{os.path.basename(path)}")
+        blob.upload_from_filename(path, content_type="application/pdf")
+        return f"gs://{bucket.name}/{blob.name}"
+
+    def load_document(blob) -> documentai.Document:
+        return documentai.Document.from_json(blob.download_as_bytes(), ignore_unknown_fields=True)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            gcs_uris = list(executor.map(upload, pdf_paths))
+        print(f"☁️ Uploaded {len(gcs_uris)} statement(s) to 'gs://{bucket.name}/{run_prefix}/input/'.")
+
+        request = documentai.BatchProcessRequest(
+            name=name,
+            input_documents=documentai.BatchDocumentsInputConfig(
+                gcs_documents=documentai.GcsDocuments(
+                    documents=[documentai.GcsDocument(gcs_uri=uri, mime_type="application/pdf") for uri in gcs_uris]
+                )
+            ),
+            document_output_config=documentai.DocumentOutputConfig(
+                gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                    gcs_uri=f"gs://{bucket.name}/{run_prefix}/output/"
+                )
+            ),
+        )
+        operation = client.batch_process_documents(request=request)
+        print(f"⏳ Waiting for batch operation '{operation.operation.name}'...")
+        operation.result(timeout=constants.GCS_BATCH_TIMEOUT)
+
+        metadata = documentai.BatchProcessMetadata(operation.metadata)
+        destinations = {
+            status.input_gcs_source: status.output_gcs_destination
+            for status in metadata.individual_process_statuses
+        }
+
+        all_cleaned_dfs = []
+        for path, uri in zip(pdf_paths, gcs_uris):
+            file_name = os.path.basename(path)
+            destination = destinations.get(uri)
+            if not destination:
+                print(f"⚠️ Could not process document: {file_name}")
                 continue
-        
-        # Last resort - let pandas try to parse
+
+            # Large documents are split into several JSON shards. Their names ("<file>-<n>.json")
+            # do not sort numerically past ten shards, so order them by the recorded shard index.
+            output_prefix = destination.split(f"gs://{bucket.name}/", 1)[1].rstrip("/") + "/"
+            shard_blobs = [blob for blob in bucket.list_blobs(prefix=output_prefix) if blob.name.endswith(".json")]
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                shards = sorted(executor.map(load_document, shard_blobs), key=lambda doc: doc.shard_info.shard_index)
+
+            # Shards are parts of one statement: the bank name and the running cardholder
+            # carry over from one shard to the next instead of resetting to 'Unknown'.
+            cleaned_dfs = []
+            bank_name, cardholder = 'Unknown', "Unknown"
+            for doc in shards:
+                # Resolved for every shard, so a cover or summary page without transactions
+                # still provides the bank name for the shards that follow it.
+                bank_name = _parse_bank_statement_info(doc, doc.text, bank_name)[0]['bank_name']
+                df = _analyze_and_create_dataframe(doc, bank_name, cardholder)
+                if df is None or df.empty:
+                    continue
+                cardholder = df['cardholder'].iat[-1]
+                cleaned_dfs.append(_preprocess_transactions(df))
+            if cleaned_dfs:
+                print(f"✅ Successfully cleaned and added {sum(map(len, cleaned_dfs))} transactions from {file_name}.")
+                all_cleaned_dfs.append(pd.concat(cleaned_dfs, ignore_index=True))
+        return all_cleaned_dfs
+    finally:
+        # Statements are sensitive; do not leave copies behind in the bucket.
         try:
-            parsed_date = pd.to_datetime(date_str, errors='coerce')
-            if pd.notna(parsed_date):
-                return parsed_date.strftime('%Y-%m-%d')
-        except:
-            pass
-        
-        return None
-    
-    # Apply date standardization
-    processed_df['transaction_date'] = processed_df['transaction_date'].apply(standardize_date)
-    
-    # Drop records with invalid dates
-    processed_df.dropna(subset=['transaction_date'], inplace=True)
-    
-    return processed_df
+            bucket.delete_blobs(list(bucket.list_blobs(prefix=f"{run_prefix}/")))
+        except Exception as e:
+            print(f"⚠️ Could not clean up 'gs://{bucket.name}/{run_prefix}/': {e}")
 
 
-# --- Public API Function ---
-def run_parsing():
-    # ... (The rest of this function remains the same as before) ...
-    all_cleaned_dfs = []
+def _write_transactions(cleaned_dfs: Iterable[Optional[pd.DataFrame]]) -> Optional[pa.Table]:
+    """
+    Streams per-statement transactions to the CSV and Parquet outputs.
 
-    print(f"🚀 Starting batch processing for files in '{constants.STATEMENTS_FOLDER}'...")
+    Each statement is appended as soon as it is yielded, and its pandas frame
+    can be released once written. The Arrow table of every statement is kept,
+    however, so that all transactions can be returned: peak memory therefore
+    still holds every parsed transaction once, in Arrow form. The outputs are
+    only (re)created once the first transactions arrive, leaving earlier
+    results untouched when nothing was extracted.
+
+    Args:
+        cleaned_dfs (Iterable[pd.DataFrame | None]): Cleaned transactions per statement, in output order.
 
+    Returns:
+        (pa.Table | None): All written transactions, held in memory, or None if there were none.
+    """
+    tables = []
+    total = 0
+    csv_writer = None
+    parquet_writer = None
+    try:
+        for cleaned_df in cleaned_dfs:
+            if cleaned_df is None or cleaned_df.empty:
+                continue
+
+            if csv_writer is None:
+                os.makedirs(constants.TEMP_DIR, exist_ok=True)
+                # The CSV stays the hand-off format for the LLM steps; the Parquet copy is
+                # a compact, typed snapshot that the categorizer reloads without re-parsing text.
+                # Both are written by Arrow's C++ writers from one shared Arrow table per statement.
+                csv_writer = pacsv.CSVWriter(
+                    constants.CSV_PATH, _CSV_SCHEMA, write_options=pacsv.WriteOptions(quoting_header="none")
+                )
+                parquet_writer = pq.ParquetWriter(constants.PARQUET_PATH, _OUTPUT_SCHEMA, compression="zstd")
+
+            table = pa.Table.from_pandas(cleaned_df, schema=_OUTPUT_SCHEMA, preserve_index=False)
+            csv_writer.write_table(table.select(_CSV_COLUMNS).cast(_CSV_SCHEMA))
+            parquet_writer.write_table(table)
+            tables.append(table)
+            total += len(cleaned_df)
+    finally:
+        if csv_writer is not None:
+            csv_writer.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+    # Concatenating Arrow tables only stitches their chunks together; no data is copied.
+    return pa.concat_tables(tables) if tables else None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client_and_name() -> (documentai.DocumentProcessorServiceClient, str):
+    """Creates the Document AI client once so its gRPC channel is reused across parsing runs."""
     opts = ClientOptions(api_endpoint=f"{constants.GCP_LOCATION}-documentai.googleapis.com")
     client = documentai.DocumentProcessorServiceClient(client_options=opts)
     name = client.processor_path(constants.GCP_PROJECT_ID, constants.GCP_LOCATION, constants.GCP_PROCESSOR_ID)
+    return client, name
+
+
+# --- Public API Function ---
+def run_parsing() -> Optional[pa.Table]:
+    """
+    Parses every PDF statement in the statements folder into a combined CSV.
+
+    When constants.GCS_BATCH_BUCKET is set, all statements go through a single
+    Document AI batch operation. Otherwise (or if the batch fails) each file is
+    sent as its own request; those calls are network-bound, so files are
+    processed concurrently on up to constants.PARSER_WORKERS threads sharing
+    one client. Each statement is written out in file order as soon as it is
+    ready, while later ones are still in flight.
+
+    Returns:
+        (pa.Table | None): All parsed transactions, kept in memory so in-process callers
+                           can hand them to the categorizer without re-reading the
+                           files, or None if no transactions were extracted.
+    """
+    cleaned_dfs = []
+
+    print(f"🚀 Starting batch processing for files in '{constants.STATEMENTS_FOLDER}'...")
+
+    client, name = _get_client_and_name()
 
     try:
         file_names = os.listdir(constants.STATEMENTS_FOLDER)
     except FileNotFoundError:
         print(f"❌ Error: The directory '{constants.STATEMENTS_FOLDER}' was not found.")
-        return
+        return None
 
-    for file_name in file_names:
-        if not file_name.lower().endswith(".pdf"):
-            continue
+    pdf_paths = [
+        os.path.join(constants.STATEMENTS_FOLDER, file_name)
+        for file_name in file_names
+        if file_name.lower().endswith(".pdf")
+    ]
 
-        file_path = os.path.join(constants.STATEMENTS_FOLDER, file_name)
-        print(f"\n📄 Processing file: {file_name}")
+    if pdf_paths and constants.GCS_BATCH_BUCKET:
+        try:
+            cleaned_dfs = _batch_process_pdfs(pdf_paths, client, name)
+            pdf_paths = []
+        except Exception as e:
+            print(f"⚠️ Batch processing failed, falling back to one request per file: {e}")
 
-        with open(file_path, "rb") as image:
-            image_content = image.read()
-        
-        raw_document = documentai.RawDocument(content=image_content, mime_type="application/pdf")
-        request = documentai.ProcessRequest(name=name, raw_document=raw_document)
-        result = client.process_document(request=request)
-        document = result.document
-
-        if document:
-            df = _analyze_and_create_dataframe(document)
-            if df is not None and not df.empty:
-                cleaned_df = _preprocess_transactions(df)
-                all_cleaned_dfs.append(cleaned_df)
-                print(f"✅ Successfully cleaned and added {len(cleaned_df)} transactions from {file_name}.")
-        else:
-            print(f"⚠️ Could not process document: {file_name}")
+    with ThreadPoolExecutor(max_workers=max(1, min(constants.PARSER_WORKERS, len(pdf_paths)))) as executor:
+        if pdf_paths:
+            cleaned_dfs = executor.map(lambda path: _process_one_pdf(path, client, name), pdf_paths)
+        transactions = _write_transactions(cleaned_dfs)
 
-    if all_cleaned_dfs:
-        final_df = pd.concat(all_cleaned_dfs, ignore_index=True)
-        
-        os.makedirs(constants.TEMP_DIR, exist_ok=True)
-        final_df.to_csv(constants.CSV_PATH, index=False)
-        
+    if transactions is not None:
         print("\n===================================================")
         print(f"🎉 Batch processing complete!")
-        print(f"Total transactions processed: {len(final_df)}")
-        print(f"💾 Combined data saved to '{constants.CSV_PATH}'")
+        print(f"Total transactions processed: {transactions.num_rows}")
+        print(f"💾 Combined data saved to '{constants.CSV_PATH}' and '{constants.PARQUET_PATH}'")
         print("===================================================")
     else:
-        print("\n⏹️ No transactions were processed or found in any of the files.")
\ No newline at end of file
+        print("\n⏹️ No transactions were processed or found in any of the files.")
+    return transactions
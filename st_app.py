@@ -4,14 +4,18 @@ import os
 import glob
 import uuid
 import time
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 # Import your existing modules
-from config import constants
+from config import constants, credentials
 from services import parser, categorizer_task
 from agents import data_analyzer_agent, code_executor_agent
 from teams import finance_team
 from autogen_agentchat.messages import TextMessage
+from autogen_core import CancellationToken
 
 # --- Page Configuration ---
 st.set_page_config(page_title="AI Financial Analyst", layout="wide")
@@ -23,15 +27,110 @@ It's a squad of financial robots ready to do your busywork, so you don't have to
 """)
 
 # --- GCP CREDENTIALS SETUP ---
-gcp_creds_json = os.getenv("GCP_CREDENTIALS_JSON")
-if gcp_creds_json:
-    os.makedirs(constants.TEMP_DIR, exist_ok=True)
-    creds_path = os.path.join(constants.TEMP_DIR, "gcp_creds.json")
-    with open(creds_path, "w") as f:
-        f.write(gcp_creds_json)
-    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = creds_path
+# Streamlit re-executes this script on every interaction; cache_resource makes
+# the data folders and credentials setup run once per server process.
+@st.cache_resource
+def _bootstrap():
+    constants.ensure_dirs()
+    credentials.setup_gcp_credentials()
+
+_bootstrap()
 # --- END GCP CREDENTIALS SETUP ---
 
+# --- SHARED EVENT LOOP ---
+# The OpenAI HTTP client is shared process-wide, so all agent work runs on one
+# long-lived loop instead of a fresh asyncio.run() loop per click; this keeps
+# its pooled connections usable and warm between questions.
+@st.cache_resource
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True).start()
+    return loop
+
+def _run_async(coro):
+    """Runs a coroutine on the shared event loop and blocks until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
+def _get_analyzer():
+    """Returns this session's data analyzer agent, creating it on first use."""
+    if "analyzer_agent" not in st.session_state:
+        st.session_state.analyzer_agent = data_analyzer_agent.get_agent()
+    return st.session_state.analyzer_agent
+
+async def _run_analysis(analyzer, work_dir: str, task: TextMessage):
+    """Clears the reused analyzer's previous conversation, then runs a team for this question."""
+    await analyzer.on_reset(CancellationToken())
+    executor = code_executor_agent.get_agent(work_dir)
+    team = finance_team.create_team(analyzer, executor)
+    return await team.run(task=task)
+# --- END SHARED EVENT LOOP ---
+
+# --- BACKGROUND STATEMENT PROCESSING ---
+# Parsing and categorization take minutes, so they run off the script thread and
+# report progress through a queue that a polling fragment drains into the UI.
+@st.cache_resource
+def _get_processing_pool() -> ThreadPoolExecutor:
+    # One worker: every run shares the statements folder and temp/data.csv.
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="statement-processing")
+
+def _process_statements(files: list, messages: queue.Queue):
+    """
+    Saves, parses, and categorizes the uploaded statements in a background thread.
+
+    Args:
+        files (list): (file name, PDF bytes) pairs captured from the uploader.
+        messages (queue.Queue): Receives a status line as each step starts.
+
+    Raises:
+        RuntimeError: If no transactions could be extracted from the statements.
+    """
+    messages.put("Status: Saving uploaded files...")
+    statements_dir = constants.STATEMENTS_FOLDER
+    os.makedirs(statements_dir, exist_ok=True)
+    # Clear old statements before saving new ones
+    for old_file in glob.glob(os.path.join(statements_dir, "*.pdf")):
+        os.remove(old_file)
+    for file_name, content in files:
+        with open(os.path.join(statements_dir, file_name), "wb") as f:
+            f.write(content)
+
+    messages.put("Status: Parsing PDFs with Document AI...")
+    transactions = parser.run_parsing()
+    if transactions is None:
+        raise RuntimeError("Parsing failed. No data was extracted.")
+
+    messages.put("Status: Categorizing transactions with AI...")
+    _run_async(categorizer_task.run_categorization(transactions))
+
+@st.fragment(run_every=2)
+def _show_processing_progress():
+    """Streams the background run's status lines and finalizes the session state once it ends."""
+    log_messages = st.session_state.processing_messages
+    while True:
+        try:
+            log_messages.append(st.session_state.processing_queue.get_nowait())
+        except queue.Empty:
+            break
+
+    future = st.session_state.processing_future
+    if not future.done():
+        with st.status("Processing statements...", expanded=True):
+            for message in log_messages:
+                st.write(message)
+        return
+
+    del st.session_state.processing_future
+    error = future.exception()
+    if error is not None:
+        st.session_state.processing_error = str(error)
+    else:
+        log_messages.append("✅ **Processing Complete!**")
+        st.session_state.files_processed = True
+        st.session_state.processing_time = (time.time() - st.session_state.processing_start) / 60
+        st.session_state.processing_log = log_messages
+    st.rerun()
+# --- END BACKGROUND STATEMENT PROCESSING ---
+
 # --- Sidebar for File Upload and Initial Processing ---
 with st.sidebar:
     st.header("Step 1: Process Statements")
@@ -43,55 +142,27 @@ with st.sidebar:
 
     st.info("Note: Initial processing can take 3-5 minutes. This only needs to be done once per session.")
 
-    process_button = st.button("Process Uploaded Statements ✨", disabled=not uploaded_files)
+    processing = "processing_future" in st.session_state
+    process_button = st.button("Process Uploaded Statements ✨", disabled=not uploaded_files or processing)
 
     # This container will hold the persistent log after processing is complete
     log_container = st.container()
 
     if process_button:
         st.session_state.clear()
-        start_time = time.time()
-        
-        # Use st.status for real-time updates during processing
-        with st.status("Starting file processing...", expanded=True) as status:
-            try:
-                log_messages = []
-
-                status.write("Status: Saving uploaded files...")
-                log_messages.append("Status: Saving uploaded files...")
-                statements_dir = constants.STATEMENTS_FOLDER
-                os.makedirs(statements_dir, exist_ok=True)
-                # Clear old statements before saving new ones
-                for old_file in glob.glob(os.path.join(statements_dir, "*.pdf")):
-                    os.remove(old_file)
-                for uploaded_file in uploaded_files:
-                    with open(os.path.join(statements_dir, uploaded_file.name), "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-
-                status.write("Status: Parsing PDFs with Document AI...")
-                log_messages.append("Status: Parsing PDFs with Document AI...")
-                parser.run_parsing()
-
-                if not os.path.exists(constants.CSV_PATH) or os.path.getsize(constants.CSV_PATH) == 0:
-                    status.update(label="Parsing failed. No data was extracted.", state="error")
-                    st.stop()
-                
-                status.write("Status: Categorizing transactions with AI...")
-                log_messages.append("Status: Categorizing transactions with AI...")
-                asyncio.run(categorizer_task.run_categorization())
-
-                status.update(label="✅ Processing Complete!", state="complete")
-                st.session_state.files_processed = True
-                log_messages.append("✅ **Processing Complete!**")
+        st.session_state.processing_start = time.time()
+        st.session_state.processing_messages = []
+        st.session_state.processing_queue = queue.Queue()
+        # Read the uploads here; the worker thread must not touch Streamlit objects.
+        files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+        st.session_state.processing_future = _get_processing_pool().submit(
+            _process_statements, files, st.session_state.processing_queue
+        )
 
-            except Exception as e:
-                status.update(label=f"An error occurred: {e}", state="error")
-
-        end_time = time.time()
-        if st.session_state.get("files_processed"):
-            st.session_state.processing_time = (end_time - start_time) / 60
-            st.session_state.processing_log = log_messages
-            st.rerun()
+    if "processing_future" in st.session_state:
+        _show_processing_progress()
+    elif "processing_error" in st.session_state:
+        st.status(f"An error occurred: {st.session_state.processing_error}", state="error")
 
     # Display the persistent log messages from session state
     if "processing_log" in st.session_state:
@@ -123,10 +194,6 @@ if st.session_state.get("files_processed"):
                 work_dir = os.path.join(constants.TEMP_DIR, f"run_{run_id}")
                 os.makedirs(work_dir, exist_ok=True)
 
-                analyzer = data_analyzer_agent.get_agent()
-                executor = code_executor_agent.get_agent(work_dir)
-                team = finance_team.create_team(analyzer, executor)
-
                 task = TextMessage(
                     content=(
                         "You must read the CSV directly from temp/data.csv using the absolute path provided in your system prompt. "
@@ -136,7 +203,7 @@ if st.session_state.get("files_processed"):
                     ),
                     source="user"
                 )
-                chat_result = asyncio.run(team.run(task=task))
+                chat_result = _run_async(_run_analysis(_get_analyzer(), work_dir, task))
                 end_time = time.time()
 
                 st.session_state.last_run_dir = work_dir
@@ -170,7 +237,6 @@ if 'last_run_dir' in st.session_state:
             # --- PDF CONVERSION AND DOWNLOAD BUTTON ---
             try:
                 from markdown_pdf import MarkdownPdf, Section
-                import os
 
                 # 1. Define the full path where the PDF will be saved
                 pdf_path = os.path.join(work_dir, "financial_report.pdf")
@@ -1,7 +1,47 @@
 # teams/finance_team.py
 
+import re
+from typing import Sequence
+
+from autogen_agentchat.base import TerminatedException
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+
+
+class FastTextMentionTermination(TextMentionTermination):
+    """
+    Terminates the conversation when the text is mentioned as a whole word.
+
+    The word-boundary pattern is compiled once and searched with the regex
+    engine, so "STOP" inside longer words (e.g. "STOPPED" in generated code or
+    its output) no longer ends the run early.
+    """
+
+    # Without this, a serialized team would load back as the plain substring-matching parent.
+    component_provider_override = "teams.finance_team.FastTextMentionTermination"
+
+    def __init__(self, text: str, sources: Sequence[str] | None = None) -> None:
+        super().__init__(text, sources)
+        self._pattern = re.compile(rf"\b{re.escape(text)}\b")
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        # Pinned copy of TextMentionTermination.__call__ from autogen-agentchat 0.7.x, with only the
+        # substring test swapped for the regex search. It relies on the parent's private _terminated,
+        # _sources and _termination_text attributes, so re-check it when upgrading autogen-agentchat.
+        if self._terminated:
+            raise TerminatedException("Termination condition has already been reached")
+        for message in messages:
+            if self._sources is not None and message.source not in self._sources:
+                continue
+
+            if self._pattern.search(message.to_text()) is not None:
+                self._terminated = True
+                return StopMessage(
+                    content=f"Text '{self._termination_text}' mentioned", source="TextMentionTermination"
+                )
+        return None
+
 
 def create_team(analyzer_agent, executor_agent) -> RoundRobinGroupChat:
     """
@@ -20,7 +60,7 @@ def create_team(analyzer_agent, executor_agent) -> RoundRobinGroupChat:
     """
     
     # Define the condition that ends the conversation.
-    termination_condition = TextMentionTermination("STOP") | MaxMessageTermination(max_messages=30)
+    termination_condition = FastTextMentionTermination("STOP") | MaxMessageTermination(max_messages=30)
 
     return RoundRobinGroupChat(
         participants=[analyzer_agent, executor_agent],
@@ -0,0 +1,36 @@
+import unittest
+
+import pandas as pd
+
+from services import parser
+
+
+def _raw_transactions(dates):
+    """Builds a frame shaped like _analyze_and_create_dataframe's output, one $5.00 withdrawal per date."""
+    return pd.DataFrame({
+        'bank_name': pd.Categorical(['CHASE BANK'] * len(dates)),
+        'cardholder': ['MOHIT AGGARWAL'] * len(dates),
+        'table_item/transaction_withdrawal_date': pd.array(dates, dtype='string[pyarrow]'),
+        'table_item/transaction_withdrawal_description': pd.array(['STARBUCKS'] * len(dates), dtype='string[pyarrow]'),
+        'table_item/transaction_withdrawal': pd.array(['$5.00'] * len(dates), dtype='string[pyarrow]'),
+    })
+
+
+class PreprocessTransactionsDateTest(unittest.TestCase):
+
+    def test_out_of_range_year_in_primary_format_keeps_statement(self):
+        df = _raw_transactions(['06/25/2024', '06/25/1024', '07/01/2024'])
+        result = parser._preprocess_transactions(df)
+        self.assertEqual(list(result['transaction_date']), ['2024-06-25', '1024-06-25', '2024-07-01'])
+
+    def test_out_of_range_fallback_value_does_not_drop_other_fallback_dates(self):
+        df = _raw_transactions(['Sept 5', '2024/06/25', '20240625', '12/31/99', 'Jan 5 2024', '2024-06-25T10:00:00+02:00'])
+        result = parser._preprocess_transactions(df)
+        self.assertEqual(
+            list(result['transaction_date'][1:]),
+            ['2024-06-25', '2024-06-25', '1999-12-31', '2024-01-05', '2024-06-25'],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()